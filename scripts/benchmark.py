@@ -5,70 +5,78 @@ Benchmark script for testing distributed LLM performance
 
 import argparse
 import asyncio
-import json
+import re
 import sys
 import time
 from pathlib import Path
-from typing import List, Dict, Any
-import statistics
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent / 'src'))
 
-from src.load_balancer import LoadBalancer
-from src.worker import Worker, WorkerType
+from src.runtime import run
+from src.worker import Worker, build_workers
+from src.serialization import write_json
 from src.config import load_workers_config
 
+# src.load_balancer (and with it aiohttp) is imported inside the functions that run
+# requests, so --help and argument errors exit without paying for the aiohttp import
+
+
+# Short-answer prompts that naturally produce 10-50 token responses
+BASE_PROMPTS = [
+    "What is the capital of {country}?",
+    "Define {concept} in one sentence.",
+    "Name three benefits of {technology}.",
+    "What year was {event}?",
+    "List the primary colors.",
+    "How many days in a week?",
+    "What is 25 + 17?",
+    "Name the largest planet.",
+    "What is the speed of light?",
+    "Who invented {invention}?"
+]
+
+PLACEHOLDER_VALUES = {
+    'country': ("France", "Japan", "Brazil", "Canada", "Australia", "Germany", "India", "Mexico"),
+    'concept': ("AI", "blockchain", "encryption", "API", "cache"),
+    'technology': ("solar panels", "electric cars", "5G", "cloud storage", "GPS"),
+    'event': ("WWI start", "moon landing", "internet creation", "first flight", "printing press invention"),
+    'invention': ("the telephone", "the light bulb", "the airplane", "the computer", "the internet"),
+}
+
+
+def _build_prompt_table() -> List[Tuple[str, Optional[str], Tuple[str, ...]]]:
+    """Resolve each base prompt's placeholder and value pool once"""
+    table = []
+    for template in BASE_PROMPTS:
+        match = re.search(r'\{(\w+)\}', template)
+        key = match.group(1) if match else None
+        table.append((template, key, PLACEHOLDER_VALUES[key] if key else ()))
+    return table
 
-def generate_test_prompts(count: int = 100) -> List[str]:
-    """Generate diverse test prompts optimized for short answers"""
-    # Short-answer prompts that naturally produce 10-50 token responses
-    base_prompts = [
-        "What is the capital of {country}?",
-        "Define {concept} in one sentence.",
-        "Name three benefits of {technology}.",
-        "What year was {event}?",
-        "List the primary colors.",
-        "How many days in a week?",
-        "What is 25 + 17?",
-        "Name the largest planet.",
-        "What is the speed of light?",
-        "Who invented {invention}?"
-    ]
-
-    countries = ["France", "Japan", "Brazil", "Canada", "Australia", "Germany", "India", "Mexico"]
-    concepts = ["AI", "blockchain", "encryption", "API", "cache"]
-    technologies = ["solar panels", "electric cars", "5G", "cloud storage", "GPS"]
-    events = ["WWI start", "moon landing", "internet creation", "first flight", "printing press invention"]
-    inventions = ["the telephone", "the light bulb", "the airplane", "the computer", "the internet"]
-
-    prompts = []
-    for i in range(count):
-        template = base_prompts[i % len(base_prompts)]
 
-        # Fill in template
-        if "{country}" in template:
-            prompt = template.format(country=countries[i % len(countries)])
-        elif "{concept}" in template:
-            prompt = template.format(concept=concepts[i % len(concepts)])
-        elif "{technology}" in template:
-            prompt = template.format(technology=technologies[i % len(technologies)])
-        elif "{event}" in template:
-            prompt = template.format(event=events[i % len(events)])
-        elif "{invention}" in template:
-            prompt = template.format(invention=inventions[i % len(inventions)])
-        else:
-            prompt = template  # Use as-is for prompts without placeholders
+PROMPT_TABLE = _build_prompt_table()
 
-        prompts.append(prompt)
 
-    return prompts
+def iter_test_prompts(count: int = 100) -> Iterator[str]:
+    """Yield diverse test prompts optimized for short answers"""
+    for i in range(count):
+        template, key, pool = PROMPT_TABLE[i % len(PROMPT_TABLE)]
+        # Use as-is for prompts without placeholders
+        yield template.format(**{key: pool[i % len(pool)]}) if key else template
+
+
+def generate_test_prompts(count: int = 100) -> List[str]:
+    """Generate diverse test prompts optimized for short answers"""
+    return list(iter_test_prompts(count))
 
 
 async def benchmark_with_scaling(workers: List[Worker], num_requests: int = 100,
                                 concurrency_levels: List[int] = None, max_tokens: int = 100):
     """Benchmark performance with different concurrency levels"""
+    from src.load_balancer import LoadBalancer
 
     if concurrency_levels is None:
         concurrency_levels = [1, 5, 10, 20, 50, 100]
@@ -78,8 +86,8 @@ async def benchmark_with_scaling(workers: List[Worker], num_requests: int = 100,
     results = []
 
     async with LoadBalancer(workers) as lb:
-        # Wait for initial health checks to complete
-        await asyncio.sleep(2)
+        # Wait for the background loop's first health-check round to complete
+        await lb.wait_for_health_check()
         
         for concurrency in concurrency_levels:
             if concurrency > num_requests:
@@ -91,14 +99,15 @@ async def benchmark_with_scaling(workers: List[Worker], num_requests: int = 100,
 
             # Warmup
             print("Warming up...")
-            await lb.process_batch(test_prompts[:5], max_concurrent=5)
+            await lb.process_batch(test_prompts[:5], max_concurrent=5, max_tokens=max_tokens)
 
             # Clear metrics before the actual benchmark
-            lb.metrics['response_times'].clear()
+            lb.metrics.reset_response_times()
+            latencies = lb.metrics.latency_histogram
             
             # Actual benchmark
             print(f"Running {num_requests} requests with concurrency {concurrency}...")
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             batch_results = await lb.process_batch(
                 test_prompts,
@@ -106,16 +115,13 @@ async def benchmark_with_scaling(workers: List[Worker], num_requests: int = 100,
                 max_tokens=max_tokens
             )
 
-            elapsed = time.time() - start_time
+            elapsed = time.perf_counter() - start_time
 
             # Calculate metrics
-            successful = sum(1 for r in batch_results if r['success'])
+            successful = sum([1 for r in batch_results if r['success']])
             failed = num_requests - successful
 
-            # Get response times from this batch only (metrics were cleared before)
-            metrics = lb.get_metrics()
-            response_times = list(lb.metrics['response_times'])
-
+            # Response times cover this batch only (metrics were cleared before)
             result = {
                 'concurrency': concurrency,
                 'total_requests': num_requests,
@@ -124,12 +130,12 @@ async def benchmark_with_scaling(workers: List[Worker], num_requests: int = 100,
                 'success_rate': (successful / num_requests) * 100,
                 'total_time': elapsed,
                 'requests_per_second': num_requests / elapsed,
-                'avg_response_time': statistics.mean(response_times) if response_times else 0,
-                'min_response_time': min(response_times) if response_times else 0,
-                'max_response_time': max(response_times) if response_times else 0,
-                'p50_response_time': statistics.median(response_times) if response_times else 0,
-                'p95_response_time': sorted(response_times)[int(0.95 * len(response_times))] if response_times else 0,
-                'p99_response_time': sorted(response_times)[int(0.99 * len(response_times))] if response_times else 0
+                'avg_response_time': latencies.mean,
+                'min_response_time': latencies.min,
+                'max_response_time': latencies.max,
+                'p50_response_time': latencies.percentile(50),
+                'p95_response_time': latencies.percentile(95),
+                'p99_response_time': latencies.percentile(99)
             }
 
             results.append(result)
@@ -145,8 +151,9 @@ async def benchmark_with_scaling(workers: List[Worker], num_requests: int = 100,
             # Show worker stats
             print("\nWorker utilization:")
             for worker in workers:
-                print(f"  {worker.id}: {worker.total_requests} requests, "
-                      f"{worker.success_rate:.1%} success rate")
+                stats = worker.stats_snapshot()
+                print(f"  {worker.id}: {stats.total_requests} requests, "
+                      f"{stats.success_rate:.1%} success rate")
 
             # Wait between tests
             if concurrency != concurrency_levels[-1]:
@@ -157,8 +164,9 @@ async def benchmark_with_scaling(workers: List[Worker], num_requests: int = 100,
 
 
 async def benchmark_worker_scaling(worker_counts: List[int], base_config: Dict,
-                                  requests_per_test: int = 50):
+                                  requests_per_test: int = 50, max_tokens: int = 100):
     """Benchmark with different numbers of workers"""
+    from src.load_balancer import LoadBalancer
 
     results = []
 
@@ -170,25 +178,16 @@ async def benchmark_worker_scaling(worker_counts: List[int], base_config: Dict,
         # Create subset of workers
         # Handle base_config being dict or list
         workers_list = base_config if isinstance(base_config, list) else base_config.get('workers', [])
-        workers = []
-        for i in range(min(count, len(workers_list))):
-            worker_data = workers_list[i]
-            workers.append(Worker(
-                id=worker_data['id'],
-                host=worker_data['host'],
-                port=worker_data['port'],
-                worker_type=WorkerType(worker_data['type'].value),
-                model=worker_data['model'],
-                max_concurrent_requests=worker_data.get('max_concurrent_requests', 5)
-            ))
+        workers = build_workers(workers_list[:count])
 
         test_prompts = generate_test_prompts(requests_per_test)
 
         async with LoadBalancer(workers) as lb:
-            # Wait for health checks
-            await asyncio.sleep(2)
+            # Wait for the first health-check round; returns as soon as every worker
+            # has answered instead of idling a fixed window per worker count
+            await lb.wait_for_health_check()
 
-            healthy_count = sum(1 for w in workers if w.is_healthy)
+            healthy_count = sum([1 for w in workers if w.is_healthy])
             print(f"Healthy workers: {healthy_count}/{count}")
 
             if healthy_count == 0:
@@ -200,11 +199,11 @@ async def benchmark_worker_scaling(worker_counts: List[int], base_config: Dict,
                 })
                 continue
 
-            start_time = time.time()
-            batch_results = await lb.process_batch(test_prompts)
-            elapsed = time.time() - start_time
+            start_time = time.perf_counter()
+            batch_results = await lb.process_batch(test_prompts, max_tokens=max_tokens)
+            elapsed = time.perf_counter() - start_time
 
-            successful = sum(1 for r in batch_results if r['success'])
+            successful = sum([1 for r in batch_results if r['success']])
 
             result = {
                 'workers': count,
@@ -251,16 +250,7 @@ def main():
     config_data = load_workers_config(args.config)
 
     # Create workers
-    workers = []
-    for worker_data in config_data:
-        workers.append(Worker(
-            id=worker_data['id'],
-            host=worker_data['host'],
-            port=worker_data['port'],
-            worker_type=WorkerType(worker_data['type']),
-            model=worker_data['model'],
-            max_concurrent_requests=worker_data.get('max_concurrent_requests', 5)
-        ))
+    workers = build_workers(config_data)
 
     print(f"Loaded {len(workers)} workers")
 
@@ -277,7 +267,7 @@ def main():
 
     if args.mode in ['concurrency', 'both']:
         print("\nStarting concurrency benchmark...")
-        concurrency_results = asyncio.run(
+        concurrency_results = run(
             benchmark_with_scaling(
                 workers, 
                 args.requests, 
@@ -289,14 +279,18 @@ def main():
 
     if args.mode in ['scaling', 'both']:
         print("\nStarting worker scaling benchmark...")
-        scaling_results = asyncio.run(
-            benchmark_worker_scaling(args.worker_counts, config_data, args.requests)
+        scaling_results = run(
+            benchmark_worker_scaling(
+                args.worker_counts,
+                config_data,
+                args.requests,
+                max_tokens=args.max_tokens
+            )
         )
         all_results['scaling_benchmark'] = scaling_results
 
     # Save results
-    with open(args.output, 'w') as f:
-        json.dump(all_results, f, indent=2)
+    write_json(args.output, all_results)
 
     print(f"\n{'='*60}")
     print("BENCHMARK COMPLETE")
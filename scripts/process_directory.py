@@ -5,32 +5,102 @@ Process multiple text files (research papers) in parallel using distributed LLM
 
 import argparse
 import asyncio
-import json
 import os
 import sys
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from string import Formatter
+from typing import Callable, List, Dict, Any, NamedTuple, Optional, Tuple
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from datetime import datetime
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent / 'src'))
 
-from src.load_balancer import LoadBalancer
-from src.worker import Worker
+from src.runtime import run
+from src.worker import Worker, build_workers
+from src.serialization import dumps, write_json
 from src.config import load_workers_config, load_config, RequestConfig, merge_request_configs
 
+# src.load_balancer (and with it aiohttp) is imported inside the functions that run
+# requests, so --help and argument errors exit without paying for the aiohttp import
+
+# Threads used to read input files concurrently
+FILE_READ_THREADS = 16
+
+# Preset prompt templates for --preset
+PRESET_PROMPTS = {
+    'research': [
+        "Extract the main research question from this paper: {content}",
+        "Summarize the methodology used in {filename}: {content}",
+        "What are the key findings of this paper? {content}",
+        "Identify the limitations mentioned in this study: {content}",
+        "Suggest future research directions based on {filename}: {content}"
+    ],
+    'summary': [
+        "Provide a concise summary of this document: {content}",
+        "Extract the main points from {filename}: {content}",
+        "What is the central argument in this paper? {content}"
+    ],
+    'analysis': [
+        "Analyze the strengths and weaknesses of this paper: {content}",
+        "How does this work contribute to the field? {content}",
+        "What innovative approaches are presented in {filename}? {content}"
+    ]
+}
+
+
+class PromptTask(NamedTuple):
+    """One prompt template to run against one file"""
+    file: str
+    prompt_template: str
+
+
+class ResultRecord(NamedTuple):
+    """Outcome of a single task, written as one line of the results file"""
+    file: str
+    prompt_template: str
+    timestamp: str
+    success: bool
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
 
 def find_text_files(directory: str, extensions: List[str] = None) -> List[str]:
     """Find all text files in directory"""
     if extensions is None:
         extensions = ['.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.csv']
 
+    # Single walk over the tree, matching every extension at once
+    suffixes = tuple(extensions)
     files = []
-    for ext in extensions:
-        files.extend(Path(directory).rglob(f'*{ext}'))
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith(suffixes):
+                files.append(os.path.join(root, name))
+
+    return files
+
+
+# Bare field names the %-format fast path can substitute
+TEMPLATE_FIELDS = ('filename', 'content')
 
-    return [str(f) for f in files]
+
+def compile_prompt_template(template: str) -> Callable[[str, str], str]:
+    """Parse a {filename}/{content} prompt template once into a fast formatter"""
+    body = []
+    for literal, field, format_spec, conversion in Formatter().parse(template):
+        complex_field = field is not None and field not in TEMPLATE_FIELDS
+        if format_spec or conversion or complex_field:
+            # Rare in prompt templates (specs, conversions, {content[0]}, {content.attr});
+            # keep full str.format semantics
+            return lambda filename, content: template.format(filename=filename, content=content)
+        body.append(literal.replace('%', '%%'))
+        if field is not None:
+            body.append(f'%({field})s')
+    compiled = ''.join(body)
+    return lambda filename, content: compiled % {'filename': filename, 'content': content}
 
 
 def read_file_content(file_path: str, max_chars: int = 10000) -> str:
@@ -48,88 +118,106 @@ def read_file_content(file_path: str, max_chars: int = 10000) -> str:
 async def process_files(workers: List[Worker], files: List[str],
                        prompts: List[str], output_file: str,
                        max_concurrent: int = 50,
-                       request_config: Optional[RequestConfig] = None) -> Dict[str, Any]:
+                       request_config: Optional[RequestConfig] = None,
+                       max_chars: int = 10000) -> Dict[str, Any]:
     """Process multiple files with given prompts"""
+    from src.load_balancer import LoadBalancer
+
+    # Read each file once, in a thread pool so slow disks overlap; prompts are
+    # only formatted right before they are sent, so the content is not copied
+    # into every task up front
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=FILE_READ_THREADS) as pool:
+        file_contents = await asyncio.gather(*[
+            loop.run_in_executor(pool, read_file_content, file_path, max_chars)
+            for file_path in files
+        ])
+    contents = dict(zip(files, file_contents))
+
+    formatters = {prompt_template: compile_prompt_template(prompt_template) for prompt_template in prompts}
+    # Prompts are formatted lazily, so try each template once up front; a broken
+    # template (e.g. an unknown {field}) fails here, before any request is sent
+    for format_prompt in formatters.values():
+        format_prompt('example.txt', 'example content')
 
     # Prepare all tasks
-    tasks = []
-    for file_path in files:
-        content = read_file_content(file_path)
-        for prompt_template in prompts:
-            # Replace {filename} and {content} in prompt
-            prompt = prompt_template.format(
-                filename=os.path.basename(file_path),
-                content=content
-            )
-            tasks.append({
-                'file': file_path,
-                'prompt': prompt,
-                'prompt_template': prompt_template
-            })
+    tasks = [
+        PromptTask(file_path, prompt_template)
+        for file_path in files
+        for prompt_template in prompts
+    ]
 
     print(f"\nProcessing {len(files)} files with {len(prompts)} prompts each")
     print(f"Total tasks: {len(tasks)}")
     print(f"Max concurrent: {max_concurrent}")
 
-    # Process with load balancer
-    start_time = time.time()
-    results = []
-
-    async with LoadBalancer(workers) as lb:
-        # Create batches to avoid overwhelming the system
-        batch_size = min(max_concurrent, len(tasks))
-
-        for i in range(0, len(tasks), batch_size):
-            batch = tasks[i:i + batch_size]
-            print(f"\nProcessing batch {i//batch_size + 1}/{(len(tasks)-1)//batch_size + 1} ({len(batch)} tasks)")
-
-            # Prepare prompts for batch
-            batch_prompts = [task['prompt'] for task in batch]
-
-            # Process batch
-            if request_config:
-                batch_results = await lb.process_batch(
-                    batch_prompts,
-                    **request_config.__dict__,
-                    max_concurrent=batch_size
-                )
-            else:
-                batch_results = await lb.process_batch(
-                    batch_prompts,
-                    max_concurrent=batch_size
+    # Per-task results are streamed to a JSONL file next to the summary; the extra
+    # ".results" keeps it distinct even when the summary itself is named *.jsonl
+    results_file = str(Path(output_file).with_suffix('.results.jsonl'))
+    successful = 0
+    failed = 0
+
+    request_kwargs = asdict(request_config) if request_config else {}
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def process_task(task: PromptTask) -> Tuple[PromptTask, Dict[str, Any]]:
+        async with semaphore:
+            try:
+                # Replace {filename} and {content} in prompt
+                prompt = formatters[task.prompt_template](
+                    os.path.basename(task.file),
+                    contents[task.file]
                 )
+                result = await lb.process_request(prompt, **request_kwargs)
+                return task, {'success': True, 'result': result}
+            except Exception as e:
+                return task, {'success': False, 'error': str(e)}
 
-            # Combine results with metadata
-            for task, result in zip(batch, batch_results):
-                result_data = {
-                    'file': task['file'],
-                    'prompt_template': task['prompt_template'],
-                    'prompt': task['prompt'],
-                    'timestamp': datetime.now().isoformat(),
-                    'success': result['success']
-                }
+    # Process with load balancer
+    start_time = time.perf_counter()
 
+    with open(results_file, 'wb') as results_out:
+        async with LoadBalancer(workers) as lb:
+            # Submit everything up front; the semaphore keeps max_concurrent in flight,
+            # so a slow request never holds back the rest of a batch
+            pending = [asyncio.ensure_future(process_task(task)) for task in tasks]
+
+            # Result timestamps have one-second resolution, so the ISO string is
+            # only formatted when the second changes rather than once per task
+            stamp_second = None
+            timestamp = ''
+
+            for completed, future in enumerate(asyncio.as_completed(pending), 1):
+                task, result = await future
+
+                now_second = int(time.time())
+                if now_second != stamp_second:
+                    stamp_second = now_second
+                    timestamp = datetime.fromtimestamp(now_second).isoformat()
+
+                # Combine results with metadata; the full prompt is left out since it
+                # can be rebuilt from the template and the file
                 if result['success']:
-                    result_data['response'] = result['result']
+                    record = ResultRecord(task.file, task.prompt_template, timestamp, True,
+                                          response=result['result'])
+                    successful += 1
                 else:
-                    result_data['error'] = result['error']
+                    record = ResultRecord(task.file, task.prompt_template, timestamp, False,
+                                          error=result['error'])
+                    failed += 1
 
-                results.append(result_data)
+                results_out.write(dumps(record._asdict()) + b'\n')
 
-            # Show progress
-            completed = min(i + batch_size, len(tasks))
-            progress = (completed / len(tasks)) * 100
-            elapsed = time.time() - start_time
-            eta = (elapsed / completed) * (len(tasks) - completed) if completed > 0 else 0
+                # Show progress
+                if completed % max_concurrent == 0 or completed == len(tasks):
+                    progress = (completed / len(tasks)) * 100
+                    elapsed = time.perf_counter() - start_time
+                    eta = (elapsed / completed) * (len(tasks) - completed)
 
-            print(f"Progress: {progress:.1f}% ({completed}/{len(tasks)}) | "
-                  f"Elapsed: {elapsed:.1f}s | ETA: {eta:.1f}s")
+                    print(f"Progress: {progress:.1f}% ({completed}/{len(tasks)}) | "
+                          f"Elapsed: {elapsed:.1f}s | ETA: {eta:.1f}s")
 
-    total_time = time.time() - start_time
-
-    # Summary statistics
-    successful = sum(1 for r in results if r['success'])
-    failed = len(results) - successful
+    total_time = time.perf_counter() - start_time
 
     summary = {
         'timestamp': datetime.now().isoformat(),
@@ -141,12 +229,11 @@ async def process_files(workers: List[Worker], files: List[str],
         'success_rate': (successful / len(tasks)) * 100,
         'total_time_seconds': total_time,
         'tasks_per_second': len(tasks) / total_time,
-        'results': results
+        'results_file': results_file
     }
 
     # Save results
-    with open(output_file, 'w') as f:
-        json.dump(summary, f, indent=2)
+    write_json(output_file, summary)
 
     print(f"\n{'='*60}")
     print("PROCESSING COMPLETE")
@@ -158,7 +245,8 @@ async def process_files(workers: List[Worker], files: List[str],
     print(f"Success rate: {(successful/len(tasks))*100:.1f}%")
     print(f"Total time: {total_time:.1f}s")
     print(f"Average speed: {len(tasks)/total_time:.2f} tasks/sec")
-    print(f"\nResults saved to: {output_file}")
+    print(f"\nSummary saved to: {output_file}")
+    print(f"Results saved to: {results_file}")
 
     return summary
 
@@ -189,7 +277,8 @@ Examples:
     parser.add_argument('-i', '--input', required=True,
                        help='Input directory containing text files')
     parser.add_argument('-o', '--output', default='processing_results.json',
-                       help='Output file for results (default: processing_results.json)')
+                       help='Output file for the run summary; per-task results are written '
+                            'to a .jsonl file alongside it (default: processing_results.json)')
     parser.add_argument('-c', '--config', default='config/workers.json',
                        help='Worker configuration file')
     parser.add_argument('-s', '--settings',
@@ -208,31 +297,10 @@ Examples:
 
     args = parser.parse_args()
 
-    # Preset prompts
-    preset_prompts = {
-        'research': [
-            "Extract the main research question from this paper: {content}",
-            "Summarize the methodology used in {filename}: {content}",
-            "What are the key findings of this paper? {content}",
-            "Identify the limitations mentioned in this study: {content}",
-            "Suggest future research directions based on {filename}: {content}"
-        ],
-        'summary': [
-            "Provide a concise summary of this document: {content}",
-            "Extract the main points from {filename}: {content}",
-            "What is the central argument in this paper? {content}"
-        ],
-        'analysis': [
-            "Analyze the strengths and weaknesses of this paper: {content}",
-            "How does this work contribute to the field? {content}",
-            "What innovative approaches are presented in {filename}? {content}"
-        ]
-    }
-
     # Get prompts
     prompts = []
     if args.preset:
-        prompts.extend(preset_prompts[args.preset])
+        prompts.extend(PRESET_PROMPTS[args.preset])
     if args.prompt:
         prompts.extend(args.prompt)
 
@@ -253,17 +321,7 @@ Examples:
     try:
         # Load workers
         config_data = load_workers_config(args.config)
-        workers = []
-        for worker_data in config_data:
-            from src.worker import Worker, WorkerType
-            workers.append(Worker(
-                id=worker_data['id'],
-                host=worker_data['host'],
-                port=worker_data['port'],
-                worker_type=WorkerType(worker_data['type']),
-                model=worker_data['model'],
-                max_concurrent_requests=worker_data.get('max_concurrent_requests', 5)
-            ))
+        workers = build_workers(config_data)
 
         # Load settings if provided
         settings = None
@@ -280,9 +338,9 @@ Examples:
             sys.exit(1)
 
         # Process files
-        asyncio.run(process_files(
+        run(process_files(
             workers, files, prompts, args.output,
-            args.max_concurrent, settings
+            args.max_concurrent, settings, args.max_chars
         ))
 
     except Exception as e:
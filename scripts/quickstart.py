@@ -5,23 +5,31 @@ Quick start script for setting up and testing the distributed LLM system
 
 import os
 import json
+import shlex
 import sys
 import subprocess
 from pathlib import Path
 
-def run_command(cmd, description):
-    """Run a command and print the result"""
+def print_step(cmd, description):
+    """Print the header for a command step"""
     print(f"\n{'='*60}")
     print(f"STEP: {description}")
     print(f"{'='*60}")
-    print(f"Running: {cmd}")
+    print(f"Running: {shlex.join(cmd)}")
     print("-" * 60)
 
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+def run_command(cmd, description):
+    """Run a command, streaming its output, and report whether it succeeded"""
+    print_step(cmd, description)
+    sys.stdout.flush()
 
-    if result.returncode == 0:
-        print(result.stdout)
-    else:
+    try:
+        result = subprocess.run(cmd, check=False, stdout=sys.stdout, stderr=subprocess.PIPE, text=True)
+    except FileNotFoundError:
+        print(f"Error: command not found: {cmd[0]}")
+        return False
+
+    if result.returncode != 0:
         print(f"Error: {result.stderr}")
 
     return result.returncode == 0
@@ -40,7 +48,7 @@ def main():
 
     # Step 2: Check uv installation
     print("\n2. Checking uv installation...")
-    if not run_command("uv --version", "Checking if uv is installed"):
+    if not run_command(["uv", "--version"], "Checking if uv is installed"):
         print("\n❌ uv is not installed. Please install uv first:")
         print("   curl -LsSf https://astral.sh/uv/install.sh | sh")
         print("   Or visit: https://github.com/astral-sh/uv")
@@ -48,7 +56,7 @@ def main():
 
     # Step 3: Install dependencies with uv
     print("\n3. Installing dependencies with uv...")
-    if not run_command("uv sync", "Installing project dependencies"):
+    if not run_command(["uv", "sync"], "Installing project dependencies"):
         print("Failed to install dependencies. Please run 'uv sync' manually.")
         sys.exit(1)
 
@@ -94,7 +102,7 @@ def main():
 
     # Step 5: Run test
     print("\n5. Running connectivity test...")
-    if not run_command("python -m src.main --config config/workers.json --test",
+    if not run_command(["python", "-m", "src.main", "--config", "config/workers.json", "--test"],
                       "Testing worker connectivity"):
         print("\n❌ Worker test failed. Check:")
         print("   - Workers are running on the specified IPs")
@@ -111,9 +119,6 @@ def main():
     print("  'metrics' - Show detailed metrics")
     print("  'quit' or 'q' - Exit")
 
-    run_command("uv run python -m src.main --config config/workers.json --interactive",
-               "Starting interactive mode")
-
     print("\n" + "="*60)
     print("QUICK START COMPLETE!")
     print("="*60)
@@ -123,5 +128,11 @@ def main():
     print("3. Run benchmarks: uv run python scripts/benchmark.py")
     print("4. Read the full documentation in README.md")
 
+    # Hand the terminal over to interactive mode instead of running it as a child process
+    interactive_cmd = ["uv", "run", "python", "-m", "src.main", "--config", "config/workers.json", "--interactive"]
+    print_step(interactive_cmd, "Starting interactive mode")
+    sys.stdout.flush()
+    os.execvp(interactive_cmd[0], interactive_cmd)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,8 +7,33 @@ A scalable system for distributing LLM inference tasks across multiple Ollama an
 __version__ = "1.0.0"
 __author__ = "Distributed LLM System"
 
-from .config import LoadBalancerConfig, RequestConfig
-from .load_balancer import LoadBalancer
-from .worker import Worker, WorkerType
+from importlib import import_module
+from typing import Any
 
-__all__ = ["LoadBalancer", "Worker", "WorkerType", "LoadBalancerConfig", "RequestConfig"]
+# Public names are imported on first access, so importing a lightweight submodule
+# (e.g. src.config) does not pull in aiohttp through the load balancer
+_LAZY_IMPORTS = {
+    "LoadBalancer": ".load_balancer",
+    "Worker": ".worker",
+    "WorkerType": ".worker",
+    "build_workers": ".worker",
+    "LoadBalancerConfig": ".config",
+    "RequestConfig": ".config",
+}
+
+__all__ = [
+    "LoadBalancer",
+    "Worker",
+    "WorkerType",
+    "build_workers",
+    "LoadBalancerConfig",
+    "RequestConfig",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,14 +2,16 @@
 Configuration settings for the distributed LLM system
 """
 
-import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .serialization import read_json, write_json
 
-@dataclass
+
+@dataclass(frozen=True)
 class LoadBalancerConfig:
     """Load balancer configuration"""
 
@@ -25,9 +27,20 @@ class LoadBalancerConfig:
     use_keepalive: bool = True
     connection_timeout: int = 10
     socket_read_timeout: int = 60
-
-
-@dataclass
+    # Worker selection: "weighted" (weighted random), "power_of_two" (best of two random picks)
+    # or "least_connections" (lowest current load relative to capacity)
+    selection_strategy: str = "weighted"
+    # Halve the weight of workers slower than the cluster's p75 response time and boost
+    # those faster than p25 by 1.5x
+    latency_feedback: bool = False
+    # Event loop for the CLI entry points: "auto" (uvloop when installed), "uvloop" or "asyncio"
+    event_loop: str = "auto"
+    # Gzip request bodies larger than this many bytes; 0 disables compression.
+    # Only enable for workers that accept Content-Encoding: gzip request bodies
+    compress_threshold: int = 0
+
+
+@dataclass(frozen=True)
 class RequestConfig:
     """Request configuration"""
 
@@ -48,8 +61,7 @@ def load_workers_config(config_path: str) -> List[Dict[str, Any]]:
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"Worker configuration file not found: {config_path}")
 
-    with open(config_path) as f:
-        config = json.load(f)
+    config = read_json(config_path)
 
     if "workers" not in config:
         raise ValueError("Configuration must contain 'workers' key")
@@ -61,11 +73,12 @@ def save_workers_config(workers: List[Dict[str, Any]], config_path: str):
     """Save worker configuration to JSON file"""
     config = {"workers": workers}
 
-    # Create directory if it doesn't exist
-    Path(config_path).parent.mkdir(parents=True, exist_ok=True)
-
-    with open(config_path, "w") as f:
-        json.dump(config, f, indent=2)
+    try:
+        write_json(config_path, config)
+    except FileNotFoundError:
+        # Create directory if it doesn't exist; only stat'd when the first write fails
+        Path(config_path).parent.mkdir(parents=True, exist_ok=True)
+        write_json(config_path, config)
 
 
 def load_config(config_path: Optional[str] = None) -> LoadBalancerConfig:
@@ -76,22 +89,25 @@ def load_config(config_path: Optional[str] = None) -> LoadBalancerConfig:
     if not os.path.exists(config_path):
         return DEFAULT_CONFIG
 
-    with open(config_path) as f:
-        config_data = json.load(f)
+    config_data = read_json(config_path)
 
     return LoadBalancerConfig(**config_data)
 
 
 def merge_request_configs(base: RequestConfig, override: Dict[str, Any]) -> RequestConfig:
     """Merge request configuration with override parameters"""
-    base_dict = base.__dict__.copy()
-    base_dict.update({k: v for k, v in override.items() if k in base_dict})
-    return RequestConfig(**base_dict)
+    field_names = base.__dataclass_fields__
+    return replace(base, **{k: v for k, v in override.items() if k in field_names})
 
 
 # Environment variable overrides
+@lru_cache(maxsize=1)
 def get_config_from_env() -> LoadBalancerConfig:
-    """Get configuration from environment variables"""
+    """Get configuration from environment variables
+
+    The result is cached for the process lifetime; call
+    ``get_config_from_env.cache_clear()`` after changing the environment.
+    """
     return LoadBalancerConfig(
         health_check_interval=int(
             os.getenv("HEALTH_CHECK_INTERVAL", DEFAULT_CONFIG.health_check_interval)
@@ -108,4 +124,9 @@ def get_config_from_env() -> LoadBalancerConfig:
         enable_metrics=os.getenv("ENABLE_METRICS", str(DEFAULT_CONFIG.enable_metrics)).lower()
         == "true",
         log_level=os.getenv("LOG_LEVEL", DEFAULT_CONFIG.log_level),
+        selection_strategy=os.getenv("SELECTION_STRATEGY", DEFAULT_CONFIG.selection_strategy),
+        latency_feedback=os.getenv("LATENCY_FEEDBACK", str(DEFAULT_CONFIG.latency_feedback)).lower()
+        == "true",
+        event_loop=os.getenv("EVENT_LOOP", DEFAULT_CONFIG.event_loop),
+        compress_threshold=int(os.getenv("COMPRESS_THRESHOLD", DEFAULT_CONFIG.compress_threshold)),
     )
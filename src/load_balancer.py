@@ -6,18 +6,151 @@ Supports Ollama, LM Studio, and Exo cluster workers
 import asyncio
 import logging
 import random
+import statistics
 import time
-from collections import deque
-from typing import Any, Dict, List, Optional
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
 
 from .config import LoadBalancerConfig, get_config_from_env
+from .metrics import RequestMetrics
+from .serialization import dumps, loads
 from .worker import Worker, WorkerType
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+SELECTION_STRATEGIES = ("weighted", "power_of_two", "least_connections")
+
+# Latency feedback: selections between watermark refreshes, and how long (seconds) a
+# worker's response-time history counts as fresh enough to adjust its weight
+LATENCY_WATERMARK_REFRESH = 50
+LATENCY_FRESHNESS = 60.0
+LATENCY_SLOW_FACTOR = 0.5
+LATENCY_FAST_FACTOR = 1.5
+
+# Health probes in flight at once, and the random delay (seconds) before each one
+HEALTH_CHECK_CONCURRENCY = 10
+HEALTH_CHECK_JITTER = 0.1
+
+
+# Templates are cached per (worker type, model, request kwargs); bounded so that
+# callers varying sampling params per request cannot grow it without limit
+PAYLOAD_TEMPLATE_CACHE_SIZE = 256
+# Serialized payloads kept for repeated prompts (benchmarks, fixed system prompts), LRU
+PAYLOAD_BYTES_CACHE_SIZE = 64
+
+
+def _ollama_template(worker: Worker, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the prompt-independent part of an Ollama /api/generate payload"""
+    get = kwargs.get
+    options = {
+        "temperature": get("temperature", 0.7),
+        "num_predict": get("max_tokens", 512),
+        "top_p": get("top_p", 0.9),
+        "top_k": get("top_k", 40),
+        "repeat_penalty": get("repeat_penalty", 1.1),
+    }
+    stop = get("stop")
+    if stop:
+        options["stop"] = stop
+    # Streamed so the completion is decoded chunk by chunk as tokens arrive
+    return {"model": worker.model, "stream": True, "options": options}
+
+
+def _lm_studio_template(worker: Worker, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the prompt-independent part of an LM Studio /v1/completions payload"""
+    get = kwargs.get
+    # Convert repeat_penalty to frequency_penalty (range [0, 2])
+    # repeat_penalty typically ranges from 0.0 to 2.0, with 1.0 being neutral
+    # frequency_penalty for LM Studio expects positive values [0, 2.0]
+    frequency_penalty = max(0.0, min(2.0, get("repeat_penalty", 1.1) - 1.0))
+    return {
+        "model": worker.model,
+        "max_tokens": get("max_tokens", 512),
+        "temperature": get("temperature", 0.7),
+        "top_p": get("top_p", 0.9),
+        "frequency_penalty": frequency_penalty,
+        "stop": get("stop"),
+        "stream": False,
+    }
+
+
+def _exo_template(worker: Worker, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the prompt-independent part of an Exo /v1/chat/completions payload"""
+    get = kwargs.get
+    system_prompt = get("system_prompt", "")
+    messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+    return {
+        "model": worker.model,
+        "messages": messages,
+        "max_tokens": get("max_tokens", 512),
+        "temperature": get("temperature", 0.7),
+        "top_p": get("top_p", 0.9),
+        "frequency_penalty": get("frequency_penalty", 0.0),
+        "presence_penalty": get("presence_penalty", 0.0),
+        "stop": get("stop"),
+        "stream": False,
+    }
+
+
+def _fill_completion_prompt(template: Dict[str, Any], prompt: str) -> Dict[str, Any]:
+    """Copy a completion payload template with the prompt filled in"""
+    payload = dict(template)
+    payload["prompt"] = prompt
+    return payload
+
+
+def _fill_chat_prompt(template: Dict[str, Any], prompt: str) -> Dict[str, Any]:
+    """Copy a chat payload template with the prompt appended as the user message"""
+    payload = dict(template)
+    payload["messages"] = template["messages"] + [{"role": "user", "content": prompt}]
+    return payload
+
+
+PAYLOAD_BUILDERS = {
+    WorkerType.OLLAMA: (_ollama_template, _fill_completion_prompt),
+    WorkerType.LM_STUDIO: (_lm_studio_template, _fill_completion_prompt),
+    WorkerType.EXO: (_exo_template, _fill_chat_prompt),
+}
+
+
+async def _read_ollama_stream(response: aiohttp.ClientResponse) -> Dict[str, Any]:
+    """Collect a streamed Ollama completion into the non-streaming response shape"""
+    parts = []
+    final: Dict[str, Any] = {}
+    async for line in response.content:
+        if not line.strip():
+            continue
+        chunk = loads(line)
+        if "error" in chunk:
+            raise Exception(f"Ollama error: {chunk['error']}")
+        parts.append(chunk.get("response", ""))
+        final = chunk
+
+    # A stream cut off before the "done" chunk is an incomplete completion, not a success
+    if not final.get("done"):
+        raise Exception("Ollama stream ended before the final chunk")
+
+    # The last chunk carries the timing/token metadata; only the text needs joining
+    final["response"] = "".join(parts)
+    return final
+
+
+async def _read_json(response: aiohttp.ClientResponse) -> Dict[str, Any]:
+    """Parse a complete JSON response body"""
+    return loads(await response.read())
+
+
+RESPONSE_READERS = {
+    WorkerType.OLLAMA: _read_ollama_stream,
+    WorkerType.LM_STUDIO: _read_json,
+    WorkerType.EXO: _read_json,
+}
+
 
 class LoadBalancer:
     """Load balancer for distributing LLM inference requests across Ollama, LM Studio, and Exo workers"""
@@ -25,18 +158,27 @@ class LoadBalancer:
     def __init__(self, workers: List[Worker], config: Optional[LoadBalancerConfig] = None):
         self.workers = workers
         self.config = config or get_config_from_env()
+        if self.config.selection_strategy not in SELECTION_STRATEGIES:
+            raise ValueError(
+                f"Unknown selection strategy {self.config.selection_strategy!r}, "
+                f"expected one of {SELECTION_STRATEGIES}"
+            )
         self.session: Optional[aiohttp.ClientSession] = None
         self.health_check_task: Optional[asyncio.Task] = None
-        self._shutdown = False
+        # Created in start() so they bind to the running event loop
+        self._shutdown: Optional[asyncio.Event] = None
+        self._first_health_check: Optional[asyncio.Event] = None
 
         # Request metrics
-        self.metrics = {
-            "total_requests": 0,
-            "successful_requests": 0,
-            "failed_requests": 0,
-            "response_times": deque(maxlen=1000),
-            "start_time": time.time(),
-        }
+        self.metrics = RequestMetrics()
+        self._payload_templates: Dict[Any, Dict[str, Any]] = {}
+        self._payload_bytes: OrderedDict[Any, bytes] = OrderedDict()
+        # Per-instance RNG for worker selection, with its bound method looked up once
+        self._rng = random.Random()
+        self._random = self._rng.random
+        # (p25, p75) of fresh workers' average response times, for latency feedback
+        self._latency_watermarks: Optional[Tuple[float, float]] = None
+        self._selections_until_refresh = 0
 
         # Setup logging
         logging.basicConfig(level=getattr(logging, self.config.log_level.upper()))
@@ -76,6 +218,8 @@ class LoadBalancer:
         )
 
         # Start health check task
+        self._shutdown = asyncio.Event()
+        self._first_health_check = asyncio.Event()
         if self.config.health_check_interval > 0:
             self.health_check_task = asyncio.create_task(self._health_check_loop())
 
@@ -83,7 +227,8 @@ class LoadBalancer:
 
     async def stop(self):
         """Stop the load balancer"""
-        self._shutdown = True
+        if self._shutdown is not None:
+            self._shutdown.set()
 
         if self.health_check_task:
             self.health_check_task.cancel()
@@ -98,47 +243,161 @@ class LoadBalancer:
         logger.info("Load balancer stopped")
 
     def _select_worker(self) -> Optional[Worker]:
-        """Select the best available worker using weighted random selection"""
-        available_workers = [w for w in self.workers if w.is_available]
-
-        if not available_workers:
+        """Select the best available worker using the configured strategy"""
+        strategy = self.config.selection_strategy
+        if strategy == "least_connections":
+            return self._select_least_connections(self.workers)
+
+        now = self._update_latency_feedback() if self.config.latency_feedback else None
+        if strategy == "power_of_two":
+            available_workers = [w for w in self.workers if w.is_available]
+            if not available_workers:
+                return None
+            return self._select_power_of_two(available_workers, now)
+        return self._select_weighted(self.workers, now)
+
+    def _select_power_of_two(
+        self, available_workers: List[Worker], now: Optional[float] = None
+    ) -> Worker:
+        """Pick two workers at random and keep the one with the higher weight"""
+        if len(available_workers) == 1:
+            return available_workers[0]
+
+        first, second = self._rng.sample(available_workers, 2)
+        first_weight, second_weight = first.weight, second.weight
+        if now is not None:
+            first_weight *= self._latency_factor(first, now)
+            second_weight *= self._latency_factor(second, now)
+        return first if first_weight >= second_weight else second
+
+    def _select_least_connections(self, workers: List[Worker]) -> Optional[Worker]:
+        """Pick the available worker with the lowest load, breaking ties at random"""
+        least_loaded: List[Worker] = []
+        least_load = 0.0
+        for worker in workers:
+            if not worker.is_available:
+                continue
+            load = worker.current_requests / worker.max_concurrent_requests
+            if not least_loaded or load < least_load:
+                least_loaded = [worker]
+                least_load = load
+            elif load == least_load:
+                least_loaded.append(worker)
+
+        if not least_loaded:
             return None
+        # Idle clusters tie on every worker; a random pick avoids always hitting the first
+        return least_loaded[int(self._random() * len(least_loaded))]
+
+    def _select_weighted(
+        self, workers: List[Worker], now: Optional[float] = None
+    ) -> Optional[Worker]:
+        """Select a worker using weighted random selection"""
+        # Weights are recomputed per call because every dispatch and completion
+        # changes a worker's load, and so its weight. Unavailable workers weigh 0.0,
+        # so this one pass also filters them out without building a separate list
+        weights = [worker.weight for worker in workers]
+        if not weights:
+            return None
+        if now is not None:
+            factor = self._latency_factor
+            weights = [weight * factor(worker, now) for weight, worker in zip(weights, workers)]
+
+        # Equal weights (e.g. idle workers with no history yet) need no weighted draw
+        if weights.count(weights[0]) == len(weights):
+            if weights[0] == 0:
+                return None
+            return workers[int(self._random() * len(workers))]
+
+        # Weighted random selection with bias for less-loaded workers. Drawing from
+        # (0, total] with bisect_left never lands on a zero-weight (unavailable) worker
+        cumulative_weights = list(accumulate(weights))
+        total_weight = cumulative_weights[-1]
+        index = bisect_left(cumulative_weights, total_weight - self._random() * total_weight)
+        return workers[index]
+
+    def _update_latency_feedback(self) -> float:
+        """Refresh the latency watermarks every few selections; returns the current time"""
+        now = time.time()
+        self._selections_until_refresh -= 1
+        if self._selections_until_refresh <= 0:
+            self._selections_until_refresh = LATENCY_WATERMARK_REFRESH
+            samples = [
+                w.average_response_time for w in self.workers if self._has_fresh_latency(w, now)
+            ]
+            if len(samples) >= 2:
+                low, _, high = statistics.quantiles(samples, n=4, method="inclusive")
+                self._latency_watermarks = (low, high)
+            else:
+                self._latency_watermarks = None
+        return now
+
+    @staticmethod
+    def _has_fresh_latency(worker: Worker, now: float) -> bool:
+        """Whether the worker has served requests recently enough to compare"""
+        # last_used is also bumped by health probes, so gate on real request completions
+        return (
+            bool(worker.response_times) and now - worker.last_request_completed <= LATENCY_FRESHNESS
+        )
 
-        # Calculate weights based on worker metrics
-        weights = []
-        for worker in available_workers:
-            weight = worker.weight
-            weights.append(weight)
-
-        # Weighted random selection with bias for less-loaded workers
-        total_weight = sum(weights)
-        if total_weight == 0:
-            return random.choice(available_workers)
-
-        rand_val = random.uniform(0, total_weight)
-        current_weight = 0
+    def _latency_factor(self, worker: Worker, now: float) -> float:
+        """Weight multiplier from where the worker sits against the latency watermarks"""
+        watermarks = self._latency_watermarks
+        if watermarks is None or not self._has_fresh_latency(worker, now):
+            return 1.0
+
+        average = worker.average_response_time
+        if average > watermarks[1]:
+            return LATENCY_SLOW_FACTOR
+        if average < watermarks[0]:
+            return LATENCY_FAST_FACTOR
+        return 1.0
+
+    async def check_health(self):
+        """Run one round of health checks across all workers"""
+        # Bound in-flight probes and jitter their start so large clusters don't open
+        # every connection (and DNS lookup) at the same instant
+        semaphore = asyncio.Semaphore(HEALTH_CHECK_CONCURRENCY)
+
+        async def probe(worker: Worker):
+            await asyncio.sleep(self._random() * HEALTH_CHECK_JITTER)
+            async with semaphore:
+                await self._check_worker_health(worker)
 
-        for worker, weight in zip(available_workers, weights):
-            current_weight += weight
-            if rand_val <= current_weight:
-                return worker
+        await asyncio.gather(*[probe(worker) for worker in self.workers], return_exceptions=True)
 
-        return available_workers[-1]
+    async def wait_for_health_check(self):
+        """Wait until every worker has been probed at least once since start()"""
+        if self.health_check_task is None or self.health_check_task.done():
+            # No background loop to wait on (health_check_interval <= 0); probe directly
+            await self.check_health()
+            return
+        await self._first_health_check.wait()
 
     async def _health_check_loop(self):
         """Periodically check worker health"""
-        while not self._shutdown:
+        while True:
             try:
-                await asyncio.gather(
-                    *[self._check_worker_health(worker) for worker in self.workers],
-                    return_exceptions=True,
-                )
-                await asyncio.sleep(self.config.health_check_interval)
+                await self.check_health()
+                delay = self.config.health_check_interval
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Health check error: {e}")
-                await asyncio.sleep(5)
+                delay = 5
+            finally:
+                self._first_health_check.set()
+
+            if await self._wait_for_shutdown(delay):
+                break
+
+    async def _wait_for_shutdown(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds, returning True as soon as stop() is called"""
+        try:
+            await asyncio.wait_for(self._shutdown.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     async def _check_worker_health(self, worker: Worker):
         """Check if a worker is healthy"""
@@ -146,10 +405,10 @@ class LoadBalancer:
             if not self.session:
                 return
 
-            start_time = time.time()
+            start_time = time.perf_counter()
             timeout = aiohttp.ClientTimeout(total=5)
             async with self.session.get(worker.health_endpoint, timeout=timeout) as response:
-                response_time = time.time() - start_time
+                response_time = time.perf_counter() - start_time
                 worker.last_health_check = time.time()
 
                 if response.status == 200:
@@ -166,96 +425,83 @@ class LoadBalancer:
             worker.is_healthy = False
             logger.warning(f"Worker {worker.id} health check failed: {e}")
 
+    def _encode_payload(self, worker: Worker, prompt: str, kwargs: Dict[str, Any]) -> bytes:
+        """Serialize a request payload, reusing the bytes of recently repeated prompts"""
+        try:
+            key = (worker.worker_type, worker.model, frozenset(kwargs.items()))
+        except TypeError:
+            # Unhashable kwargs (e.g. a list of stop sequences) skip the caches
+            return dumps(self._build_payload(worker, prompt, kwargs, None))
+
+        body_key = (key, prompt)
+        body = self._payload_bytes.get(body_key)
+        if body is None:
+            body = dumps(self._build_payload(worker, prompt, kwargs, key))
+            self._payload_bytes[body_key] = body
+            if len(self._payload_bytes) > PAYLOAD_BYTES_CACHE_SIZE:
+                self._payload_bytes.popitem(last=False)
+        else:
+            self._payload_bytes.move_to_end(body_key)
+        return body
+
+    def _build_payload(
+        self, worker: Worker, prompt: str, kwargs: Dict[str, Any], key: Optional[Tuple]
+    ) -> Dict[str, Any]:
+        """Build a request payload, reusing the cached template for key if there is one"""
+        build_template, fill_prompt = PAYLOAD_BUILDERS[worker.worker_type]
+        template = self._payload_templates.get(key) if key is not None else None
+
+        if template is None:
+            template = build_template(worker, kwargs)
+            if key is not None:
+                if len(self._payload_templates) >= PAYLOAD_TEMPLATE_CACHE_SIZE:
+                    self._payload_templates.clear()
+                self._payload_templates[key] = template
+
+        return fill_prompt(template, prompt)
+
     async def _make_request(self, worker: Worker, prompt: str, **kwargs) -> Dict[str, Any]:
         """Make a request to a specific worker"""
         worker.current_requests += 1
 
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
 
             # Prepare payload based on worker type
-            if worker.worker_type == WorkerType.OLLAMA:
-                payload = {
-                    "model": worker.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": kwargs.get("temperature", 0.7),
-                        "num_predict": kwargs.get("max_tokens", 512),
-                        "top_p": kwargs.get("top_p", 0.9),
-                        "top_k": kwargs.get("top_k", 40),
-                        "repeat_penalty": kwargs.get("repeat_penalty", 1.1),
-                    },
-                }
-                if kwargs.get("stop"):
-                    payload["options"]["stop"] = kwargs["stop"]
-            elif worker.worker_type == WorkerType.LM_STUDIO:
-                # Convert repeat_penalty to frequency_penalty (range [0, 2])
-                # repeat_penalty typically ranges from 0.0 to 2.0, with 1.0 being neutral
-                # frequency_penalty for LM Studio expects positive values [0, 2.0]
-                repeat_penalty = kwargs.get("repeat_penalty", 1.1)
-                frequency_penalty = max(0.0, min(2.0, repeat_penalty - 1.0))
-                
-                payload = {
-                    "model": worker.model,
-                    "prompt": prompt,
-                    "max_tokens": kwargs.get("max_tokens", 512),
-                    "temperature": kwargs.get("temperature", 0.7),
-                    "top_p": kwargs.get("top_p", 0.9),
-                    "frequency_penalty": frequency_penalty,
-                    "stop": kwargs.get("stop"),
-                    "stream": False,
-                }
-            else:  # EXO - ChatGPT-compatible format
-                messages = []
-                system_prompt = kwargs.get("system_prompt", "")
-                if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
-                messages.append({"role": "user", "content": prompt})
-
-                payload = {
-                    "model": worker.model,
-                    "messages": messages,
-                    "max_tokens": kwargs.get("max_tokens", 512),
-                    "temperature": kwargs.get("temperature", 0.7),
-                    "top_p": kwargs.get("top_p", 0.9),
-                    "frequency_penalty": kwargs.get("frequency_penalty", 0.0),
-                    "presence_penalty": kwargs.get("presence_penalty", 0.0),
-                    "stop": kwargs.get("stop"),
-                    "stream": False,
-                }
-
-            async with self.session.post(worker.api_endpoint, json=payload) as response:
-                response_time = time.time() - start_time
-
+            body = self._encode_payload(worker, prompt, kwargs)
+            threshold = self.config.compress_threshold
+            # Long prompts (RAG contexts, few-shot examples) are worth gzipping on the wire
+            compress = "gzip" if threshold and len(body) > threshold else None
+
+            async with self.session.post(
+                worker.api_endpoint, data=body, compress=compress
+            ) as response:
                 if response.status == 200:
-                    result = await response.json()
+                    result = await RESPONSE_READERS[worker.worker_type](response)
+                    response_time = time.perf_counter() - start_time
                     worker.update_response_time(response_time)
                     worker.record_success()
+                    worker.last_request_completed = time.time()
 
                     # Update metrics
                     if self.config.enable_metrics:
-                        self.metrics["response_times"].append(response_time)
-                        self.metrics["successful_requests"] += 1
+                        self.metrics.record_response_time(response_time)
+                        self.metrics.successful_requests += 1
 
                     return result
                 else:
                     error_text = await response.text()
-                    worker.record_failure()
-                    self.metrics["failed_requests"] += 1
                     raise Exception(f"HTTP {response.status}: {error_text}")
 
-        except asyncio.TimeoutError:
+        except Exception:
+            # Single failure path (timeouts, transport errors and non-200 responses) so
+            # each failed request is counted exactly once
             worker.record_failure()
-            self.metrics["failed_requests"] += 1
-            raise  # Preserve original TimeoutError type and context
-        except Exception as e:
-            worker.record_failure()
-            self.metrics["failed_requests"] += 1
+            self.metrics.failed_requests += 1
             raise  # Preserve original exception type and context
         finally:
             worker.current_requests -= 1
-            self.metrics["total_requests"] += 1
+            self.metrics.total_requests += 1
 
     async def process_request(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Process a single request with retries"""
@@ -292,63 +538,51 @@ class LoadBalancer:
     async def process_batch(self, prompts: List[str], **kwargs) -> List[Dict[str, Any]]:
         """Process a batch of requests concurrently"""
         max_concurrent = kwargs.pop("max_concurrent", self.config.max_concurrent_batch)
-        semaphore = asyncio.Semaphore(max_concurrent)
+        results: List[Dict[str, Any]] = [None] * len(prompts)
 
-        async def process_single(prompt: str, index: int) -> Dict[str, Any]:
-            async with semaphore:
+        # A fixed pool of max_concurrent consumers shares one iterator over the
+        # prompts, instead of one task per prompt all waiting on a semaphore
+        pending = iter(enumerate(prompts))
+
+        async def consume():
+            for index, prompt in pending:
                 try:
                     result = await self.process_request(prompt, **kwargs)
-                    return {"index": index, "success": True, "result": result}
+                    results[index] = {"success": True, "result": result}
                 except Exception as e:
-                    return {"index": index, "success": False, "error": str(e)}
+                    results[index] = {"success": False, "error": str(e)}
 
-        tasks = [process_single(prompt, i) for i, prompt in enumerate(prompts)]
-        results = await asyncio.gather(*tasks)
+        await asyncio.gather(*[consume() for _ in range(min(max_concurrent, len(prompts)))])
 
-        # Sort by original index
-        results.sort(key=lambda x: x["index"])
+        # Each consumer writes into its prompt's slot, so results are already in order
         return results
 
     def get_metrics(self) -> Dict[str, Any]:
         """Get performance metrics"""
-        uptime = time.time() - self.metrics["start_time"]
-
-        # Calculate average response time
-        if self.metrics["response_times"]:
-            avg_response_time = sum(self.metrics["response_times"]) / len(
-                self.metrics["response_times"]
-            )
-        else:
-            avg_response_time = 0.0
+        uptime = time.time() - self.metrics.start_time
 
         # Calculate requests per second
-        rps = self.metrics["total_requests"] / uptime if uptime > 0 else 0
+        rps = self.metrics.total_requests / uptime if uptime > 0 else 0
 
         # Calculate success rate
-        if self.metrics["total_requests"] > 0:
-            success_rate = (
-                self.metrics["successful_requests"] / self.metrics["total_requests"]
-            ) * 100
+        if self.metrics.total_requests > 0:
+            success_rate = (self.metrics.successful_requests / self.metrics.total_requests) * 100
         else:
             success_rate = 0.0
 
         return {
             "uptime_seconds": uptime,
             "requests": {
-                "total": self.metrics["total_requests"],
-                "successful": self.metrics["successful_requests"],
-                "failed": self.metrics["failed_requests"],
+                "total": self.metrics.total_requests,
+                "successful": self.metrics.successful_requests,
+                "failed": self.metrics.failed_requests,
                 "success_rate_percent": success_rate,
                 "requests_per_second": rps,
             },
             "performance": {
-                "average_response_time": avg_response_time,
-                "min_response_time": min(self.metrics["response_times"])
-                if self.metrics["response_times"]
-                else 0,
-                "max_response_time": max(self.metrics["response_times"])
-                if self.metrics["response_times"]
-                else 0,
+                "average_response_time": self.metrics.average_response_time,
+                "min_response_time": self.metrics.min_response_time,
+                "max_response_time": self.metrics.max_response_time,
             },
             "workers": [worker.to_dict() for worker in self.workers],
             "load_balancer_config": {
@@ -379,18 +613,17 @@ class LoadBalancer:
         )
         print("-" * 80)
 
-        for worker in self.workers:
-            health = "✓" if worker.is_healthy else "✗"
-            load_pct = f"{worker.load_percentage:.0f}%"
-            resp_time = (
-                f"{worker.average_response_time:.2f}s"
-                if worker.average_response_time > 0
-                else "N/A"
-            )
+        # Reuse the worker dicts get_metrics already built instead of re-deriving every
+        # property in a second pass over the workers
+        for worker in metrics["workers"]:
+            health = "✓" if worker["is_healthy"] else "✗"
+            load_pct = f"{worker['load_percentage']:.0f}%"
+            average_response_time = worker["average_response_time"]
+            resp_time = f"{average_response_time:.2f}s" if average_response_time > 0 else "N/A"
 
             print(
-                f"{worker.id:<20} {worker.host:<15} {worker.port:<6} "
-                f"{worker.worker_type.value:<11} {load_pct:<6} {health:<8} {resp_time:<10}"
+                f"{worker['id']:<20} {worker['host']:<15} {worker['port']:<6} "
+                f"{worker['type']:<11} {load_pct:<6} {health:<8} {resp_time:<10}"
             )
 
         print("=" * 80 + "\n")
@@ -4,33 +4,30 @@ Main entry point for the distributed LLM load balancer
 
 import argparse
 import asyncio
-import json
 import os
 import sys
+from collections import Counter
 from pathlib import Path
 from typing import Any, Dict, List
 
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent))
 
-from src.config import load_config, load_workers_config
-from src.load_balancer import LoadBalancer
+from src.config import get_config_from_env, load_config, load_workers_config
+from src.runtime import run
+from src.serialization import dumps, write_json
 from src.worker import Worker, WorkerType
 
+# src.load_balancer (and with it aiohttp) is imported inside the modes that need it,
+# so --help and configuration errors exit without paying for the aiohttp import
+
 
 def create_workers_from_config(config_data: List[Dict[str, Any]]) -> List[Worker]:
     """Create worker instances from configuration data"""
     workers = []
     for worker_data in config_data:
         try:
-            worker = Worker(
-                id=worker_data["id"],
-                host=worker_data["host"],
-                port=worker_data["port"],
-                worker_type=WorkerType(worker_data["type"]),
-                model=worker_data["model"],
-                max_concurrent_requests=worker_data.get("max_concurrent_requests", 5),
-            )
+            worker = Worker.from_dict(worker_data)
             workers.append(worker)
             print(f"Added worker: {worker}")
         except KeyError as e:
@@ -45,6 +42,8 @@ def create_workers_from_config(config_data: List[Dict[str, Any]]) -> List[Worker
 
 async def test_workers(workers: List[Worker]):
     """Test connectivity to all workers"""
+    from src.load_balancer import LoadBalancer
+
     print("\nTesting worker connectivity...")
     print("-" * 60)
 
@@ -74,7 +73,10 @@ async def test_workers(workers: List[Worker]):
 
 async def interactive_mode(workers: List[Worker]):
     """Interactive mode for testing requests"""
+    from src.load_balancer import LoadBalancer
+
     async with LoadBalancer(workers) as lb:
+        now = asyncio.get_running_loop().time
         print("\n" + "=" * 60)
         print("INTERACTIVE MODE")
         print("=" * 60)
@@ -92,17 +94,17 @@ async def interactive_mode(workers: List[Worker]):
                     continue
                 elif prompt.lower() == "metrics":
                     metrics = lb.get_metrics()
-                    print(json.dumps(metrics, indent=2))
+                    print(dumps(metrics, indent=True).decode())
                     continue
                 elif not prompt:
                     continue
 
                 print("\nProcessing...")
-                start_time = asyncio.get_event_loop().time()
+                start_time = now()
 
                 try:
                     result = await lb.process_request(prompt)
-                    elapsed = asyncio.get_event_loop().time() - start_time
+                    elapsed = now() - start_time
 
                     # Extract response based on worker type
                     if result and "response" in result:
@@ -123,7 +125,7 @@ async def interactive_mode(workers: List[Worker]):
                     print("-" * 40)
 
                 except Exception as e:
-                    elapsed = asyncio.get_event_loop().time() - start_time
+                    elapsed = now() - start_time
                     print(f"\nError after {elapsed:.2f}s: {e}")
 
             except KeyboardInterrupt:
@@ -133,6 +135,8 @@ async def interactive_mode(workers: List[Worker]):
 
 async def benchmark_mode(workers: List[Worker], num_requests: int = 50):
     """Benchmark mode for performance testing"""
+    from src.load_balancer import LoadBalancer
+
     print(f"\nRunning benchmark with {num_requests} concurrent requests...")
 
     test_prompts = [
@@ -146,14 +150,15 @@ async def benchmark_mode(workers: List[Worker], num_requests: int = 50):
     test_prompts = test_prompts[:num_requests]
 
     async with LoadBalancer(workers) as lb:
-        start_time = asyncio.get_event_loop().time()
+        now = asyncio.get_running_loop().time
+        start_time = now()
 
         results = await lb.process_batch(test_prompts, max_concurrent=num_requests)
 
-        elapsed = asyncio.get_event_loop().time() - start_time
+        elapsed = now() - start_time
 
         # Calculate statistics
-        successful = sum(1 for r in results if r["success"])
+        successful = sum([1 for r in results if r["success"]])
         failed = len(results) - successful
         rps = len(results) / elapsed
 
@@ -203,48 +208,53 @@ def main():
         settings = None
         if args.settings and os.path.exists(args.settings):
             settings = load_config(args.settings)
+        event_loop = (settings or get_config_from_env()).event_loop
 
         print(f"Loaded {len(workers)} workers from configuration")
+        type_counts = Counter(w.worker_type for w in workers)
         print(
-            f"Worker types: {len([w for w in workers if w.worker_type.value == 'ollama'])} Ollama, "
-            f"{len([w for w in workers if w.worker_type.value == 'lm_studio'])} LM Studio, "
-            f"{len([w for w in workers if w.worker_type.value == 'exo'])} Exo"
+            f"Worker types: {type_counts[WorkerType.OLLAMA]} Ollama, "
+            f"{type_counts[WorkerType.LM_STUDIO]} LM Studio, "
+            f"{type_counts[WorkerType.EXO]} Exo"
         )
 
         # Run appropriate mode
         if args.test:
-            success = asyncio.run(test_workers(workers))
+            success = run(test_workers(workers), event_loop)
             sys.exit(0 if success else 1)
 
         elif args.interactive:
-            asyncio.run(interactive_mode(workers))
+            run(interactive_mode(workers), event_loop)
 
         elif args.benchmark:
-            asyncio.run(benchmark_mode(workers, args.benchmark))
+            run(benchmark_mode(workers, args.benchmark), event_loop)
 
         elif args.prompt:
+            from src.load_balancer import LoadBalancer
+
             async def single_request():
                 async with LoadBalancer(workers, config=settings) as lb:
                     result = await lb.process_request(args.prompt)
                     return result
 
-            result = asyncio.run(single_request())
+            result = run(single_request(), event_loop)
             if args.output:
-                with open(args.output, "w") as f:
-                    json.dump(result, f, indent=2)
+                write_json(args.output, result)
                 print(f"Result saved to {args.output}")
             else:
                 print("\nResult:")
-                print(json.dumps(result, indent=2))
+                print(dumps(result, indent=True).decode())
 
         else:
+            from src.load_balancer import LoadBalancer
+
             # Default: show status
             async def show_status():
                 async with LoadBalancer(workers, config=settings) as lb:
                     await asyncio.sleep(2)  # Let health checks run
                     lb.print_status()
 
-            asyncio.run(show_status())
+            run(show_status(), event_loop)
 
     except Exception as e:
         print(f"Error: {e}")
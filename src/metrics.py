@@ -0,0 +1,158 @@
+"""
+Latency tracking with bounded memory
+"""
+
+import math
+import time
+from collections import deque
+from typing import Deque, Tuple
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with fixed memory and O(1) recording"""
+
+    def __init__(self, min_value: float = 1e-4, max_value: float = 3600.0, precision: float = 0.01):
+        self.min_value = min_value
+        self.max_value = max_value
+        self._growth = 1.0 + precision
+        self._log_growth = math.log(self._growth)
+        # Buckets share a constant relative width, so percentiles stay within
+        # `precision` of the true value however many observations are recorded.
+        # Observations above max_value go to a separate overflow bucket
+        self._overflow = self._bucket_index(max_value) + 1
+        self._counts = [0] * (self._overflow + 1)
+        self.reset()
+
+    def _bucket_index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_growth) + 1
+
+    def reset(self):
+        """Discard all recorded values"""
+        for i in range(len(self._counts)):
+            self._counts[i] = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def record(self, value: float):
+        """Record a single observation (in seconds)"""
+        index = self._overflow if value > self.max_value else self._bucket_index(value)
+        self._counts[index] += 1
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    @property
+    def mean(self) -> float:
+        """Exact mean of the recorded values"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Approximate nearest-rank percentile of the recorded values"""
+        if self.count == 0:
+            return 0.0
+
+        # Nearest-rank definition: the smallest value with at least pct% of
+        # observations at or below it
+        rank = min(max(1, math.ceil(pct / 100 * self.count)), self.count)
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index == self._overflow:
+                    # Beyond max_value there are no bucket edges; the exact max bounds it
+                    return self.max
+                # Upper edge of the bucket, clamped to the observed range
+                upper = self.min_value * self._growth**index
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+
+class RequestMetrics:
+    """Load balancer request counters and response-time windows"""
+
+    __slots__ = (
+        "total_requests",
+        "successful_requests",
+        "failed_requests",
+        "response_times",
+        "latency_histogram",
+        "start_time",
+        "_window_sum",
+        "_window_min",
+        "_window_max",
+        "_samples_seen",
+    )
+
+    def __init__(self, window: int = 1000):
+        self.total_requests = 0
+        self.successful_requests = 0
+        self.failed_requests = 0
+        self.response_times: Deque[float] = deque(maxlen=window)
+        self.latency_histogram = LatencyHistogram()
+        self.start_time = time.time()
+        # Running aggregates over response_times; the min/max deques are monotonic
+        # queues of (sample number, value) so evicting the oldest sample is O(1)
+        self._window_sum = 0.0
+        self._window_min: Deque[Tuple[int, float]] = deque()
+        self._window_max: Deque[Tuple[int, float]] = deque()
+        self._samples_seen = 0
+
+    def record_response_time(self, response_time: float):
+        """Add a response time to the rolling window and the latency histogram"""
+        times = self.response_times
+        if len(times) == times.maxlen:
+            self._window_sum -= times[0]
+        times.append(response_time)
+        self._window_sum += response_time
+
+        sample = self._samples_seen
+        self._samples_seen += 1
+        oldest_in_window = sample - len(times) + 1
+
+        window_min = self._window_min
+        while window_min and window_min[-1][1] >= response_time:
+            window_min.pop()
+        window_min.append((sample, response_time))
+        if window_min[0][0] < oldest_in_window:
+            window_min.popleft()
+
+        window_max = self._window_max
+        while window_max and window_max[-1][1] <= response_time:
+            window_max.pop()
+        window_max.append((sample, response_time))
+        if window_max[0][0] < oldest_in_window:
+            window_max.popleft()
+
+        self.latency_histogram.record(response_time)
+
+    def reset_response_times(self):
+        """Discard the rolling window and the latency histogram"""
+        self.response_times.clear()
+        self.latency_histogram.reset()
+        self._window_sum = 0.0
+        self._window_min.clear()
+        self._window_max.clear()
+
+    @property
+    def average_response_time(self) -> float:
+        """Mean of the rolling response-time window"""
+        if not self.response_times:
+            return 0.0
+        return self._window_sum / len(self.response_times)
+
+    @property
+    def min_response_time(self) -> float:
+        """Fastest response in the rolling window"""
+        return self._window_min[0][1] if self._window_min else 0
+
+    @property
+    def max_response_time(self) -> float:
+        """Slowest response in the rolling window"""
+        return self._window_max[0][1] if self._window_max else 0
@@ -0,0 +1,34 @@
+"""
+Event loop helpers with an optional uvloop fast path
+"""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional dependency
+    uvloop = None
+
+T = TypeVar("T")
+
+
+EVENT_LOOPS = ("auto", "uvloop", "asyncio")
+
+
+def run(main: Coroutine[Any, Any, T], event_loop: str = "auto") -> T:
+    """Run a coroutine to completion on the requested event loop
+
+    "auto" uses uvloop when it is installed and the stock asyncio loop otherwise.
+    """
+    if event_loop not in EVENT_LOOPS:
+        main.close()
+        raise ValueError(f"Unknown event loop {event_loop!r}, expected one of {EVENT_LOOPS}")
+
+    if event_loop == "uvloop" and uvloop is None:
+        main.close()
+        raise RuntimeError("event_loop is set to 'uvloop' but uvloop is not installed")
+
+    if event_loop != "asyncio" and uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
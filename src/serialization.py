@@ -0,0 +1,37 @@
+"""
+JSON serialization helpers with an optional orjson fast path
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Deserialize JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: str) -> Any:
+    """Read and deserialize a JSON file"""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_json(path: str, obj: Any):
+    """Write an object to a file as indented JSON"""
+    with open(path, "wb") as f:
+        f.write(dumps(obj, indent=True))
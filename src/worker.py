@@ -2,11 +2,12 @@
 Worker node abstraction for Ollama, LM Studio, and Exo clusters
 """
 
+import sys
 import time
 from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Deque, Dict
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
 
 
 class WorkerType(Enum):
@@ -14,8 +15,44 @@ class WorkerType(Enum):
     LM_STUDIO = "lm_studio"
     EXO = "exo"
 
+    @classmethod
+    def from_value(cls, value: str) -> "WorkerType":
+        """Look up a worker type by its config value"""
+        try:
+            return _WORKER_TYPES_BY_VALUE[value]
+        except KeyError:
+            raise ValueError(f"{value!r} is not a valid {cls.__name__}") from None
+
+
+_WORKER_TYPES_BY_VALUE: Dict[str, WorkerType] = {t.value: t for t in WorkerType}
+
+_API_PATHS: Dict[WorkerType, str] = {
+    WorkerType.OLLAMA: "/api/generate",
+    WorkerType.LM_STUDIO: "/v1/completions",
+    WorkerType.EXO: "/v1/chat/completions",
+}
+
+# LM Studio and Exo both expose the OpenAI-compatible model listing
+_HEALTH_PATHS: Dict[WorkerType, str] = {
+    WorkerType.OLLAMA: "/api/tags",
+    WorkerType.LM_STUDIO: "/v1/models",
+    WorkerType.EXO: "/v1/models",
+}
+
+
+class WorkerStats(NamedTuple):
+    """Point-in-time request counters for a worker"""
+
+    total_requests: int
+    failed_requests: int
+    success_rate: float
+
+
+# slots=True needs Python 3.10+; older interpreters keep a per-instance __dict__
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Worker:
     """Represents a worker node (Ollama, LM Studio, or Exo cluster instance)"""
 
@@ -32,26 +69,40 @@ class Worker:
     total_requests: int = 0
     failed_requests: int = 0
     last_used: float = field(default_factory=time.time)
+    # Wall-clock time of the last successful request; health probes don't touch it
+    last_request_completed: float = field(default=0.0, init=False, repr=False, compare=False)
+    _base_url: str = field(default="", init=False, repr=False, compare=False)
+    _api_endpoint: str = field(default="", init=False, repr=False, compare=False)
+    _health_endpoint: str = field(default="", init=False, repr=False, compare=False)
+    # Running sum of response_times, so average_response_time is O(1)
+    _response_time_sum: float = field(default=0.0, init=False, repr=False, compare=False)
+    # (current_requests, max_concurrent_requests, weight) from the last weight computation
+    _weight_cache: Optional[Tuple[int, int, float]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # to_dict() result, keyed by the mutable state it was built from
+    _dict_cache: Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._response_time_sum = sum(self.response_times)
+        # host, port and type are fixed after construction, so build the URLs once
+        self._base_url = f"http://{self.host}:{self.port}"
+        self._api_endpoint = self._base_url + _API_PATHS[self.worker_type]
+        self._health_endpoint = self._base_url + _HEALTH_PATHS[self.worker_type]
 
     @property
     def base_url(self) -> str:
-        return f"http://{self.host}:{self.port}"
+        return self._base_url
 
     @property
     def api_endpoint(self) -> str:
-        if self.worker_type == WorkerType.OLLAMA:
-            return f"{self.base_url}/api/generate"
-        elif self.worker_type == WorkerType.LM_STUDIO:
-            return f"{self.base_url}/v1/completions"
-        else:  # EXO
-            return f"{self.base_url}/v1/chat/completions"
+        return self._api_endpoint
 
     @property
     def health_endpoint(self) -> str:
-        if self.worker_type == WorkerType.OLLAMA:
-            return f"{self.base_url}/api/tags"
-        else:  # LM Studio or EXO
-            return f"{self.base_url}/v1/models"
+        return self._health_endpoint
 
     @property
     def is_chat_format(self) -> bool:
@@ -73,7 +124,7 @@ class Worker:
         """Calculate average response time"""
         if not self.response_times:
             return 0.0
-        return sum(self.response_times) / len(self.response_times)
+        return self._response_time_sum / len(self.response_times)
 
     @property
     def success_rate(self) -> float:
@@ -89,6 +140,22 @@ class Worker:
         if not self.is_available:
             return 0.0
 
+        # Reuse the last weight while the load is unchanged; the recorders below drop the
+        # cache whenever the response-time or success history moves
+        cached = self._weight_cache
+        if (
+            cached is not None
+            and cached[0] == self.current_requests
+            and cached[1] == self.max_concurrent_requests
+        ):
+            return cached[2]
+
+        weight = self._compute_weight()
+        self._weight_cache = (self.current_requests, self.max_concurrent_requests, weight)
+        return weight
+
+    def _compute_weight(self) -> float:
+        """Compute the weight of an available worker from its load and history"""
         # Availability weight (inverse of current load)
         availability_weight = (
             self.max_concurrent_requests - self.current_requests
@@ -111,37 +178,86 @@ class Worker:
 
     def update_response_time(self, response_time: float):
         """Update response time history"""
-        self.response_times.append(response_time)
+        times = self.response_times
+        if len(times) == times.maxlen:
+            self._response_time_sum -= times[0]
+        times.append(response_time)
+        self._response_time_sum += response_time
+        self._weight_cache = None
         self.last_used = time.time()
 
     def record_success(self):
         """Record a successful request"""
         self.total_requests += 1
+        self._weight_cache = None
 
     def record_failure(self):
         """Record a failed request"""
         self.total_requests += 1
         self.failed_requests += 1
+        self._weight_cache = None
+
+    def stats_snapshot(self) -> WorkerStats:
+        """Read the request counters once, as a consistent snapshot"""
+        total = self.total_requests
+        failed = self.failed_requests
+        success_rate = (total - failed) / total if total else 1.0
+        return WorkerStats(total, failed, success_rate)
 
     def to_dict(self) -> Dict:
         """Convert worker to dictionary"""
+        # Every mutation of the exported state changes one of these; the response-time
+        # window is keyed by its running sum and length, since two updates can land in
+        # the same time.time() tick and leave last_used unchanged
+        state = (
+            self.is_healthy,
+            self.current_requests,
+            self.max_concurrent_requests,
+            self.total_requests,
+            self.failed_requests,
+            self.last_used,
+            self.last_health_check,
+            self._response_time_sum,
+            len(self.response_times),
+        )
+        cache = self._dict_cache
+        if cache is None or cache[0] != state:
+            cache = self._dict_cache = (state, self._build_dict(state))
+        return dict(cache[1])
+
+    def _build_dict(self, state: Tuple[Any, ...]) -> Dict:
+        # Derive the computed fields from the state already read by to_dict instead of
+        # going through the is_available/load_percentage/... properties
+        (
+            healthy,
+            current,
+            max_concurrent,
+            total,
+            failed,
+            last_used,
+            last_health_check,
+            response_time_sum,
+            response_count,
+        ) = state
         return {
             "id": self.id,
             "host": self.host,
             "port": self.port,
             "type": self.worker_type.value,
             "model": self.model,
-            "is_healthy": self.is_healthy,
-            "is_available": self.is_available,
-            "current_requests": self.current_requests,
-            "max_concurrent_requests": self.max_concurrent_requests,
-            "load_percentage": self.load_percentage,
-            "average_response_time": self.average_response_time,
-            "success_rate": self.success_rate,
-            "total_requests": self.total_requests,
-            "failed_requests": self.failed_requests,
-            "last_used": self.last_used,
-            "last_health_check": self.last_health_check,
+            "is_healthy": healthy,
+            "is_available": healthy and current < max_concurrent,
+            "current_requests": current,
+            "max_concurrent_requests": max_concurrent,
+            "load_percentage": (current / max_concurrent) * 100,
+            "average_response_time": (
+                response_time_sum / response_count if response_count else 0.0
+            ),
+            "success_rate": (total - failed) / total if total else 1.0,
+            "total_requests": total,
+            "failed_requests": failed,
+            "last_used": last_used,
+            "last_health_check": last_health_check,
         }
 
     def __str__(self) -> str:
@@ -156,7 +272,12 @@ class Worker:
             id=data["id"],
             host=data["host"],
             port=data["port"],
-            worker_type=WorkerType(data["type"]),
+            worker_type=WorkerType.from_value(data["type"]),
             model=data["model"],
             max_concurrent_requests=data.get("max_concurrent_requests", 5),
         )
+
+
+def build_workers(config_data: List[Dict[str, Any]]) -> List[Worker]:
+    """Create worker instances from worker configuration entries"""
+    return [Worker.from_dict(worker_data) for worker_data in config_data]